@@ -1,12 +1,11 @@
 #!/usr/bin/env python3
 
 import argparse
-import datetime as dt
+from functools import cache
 from pathlib import Path
 import re
 import sys
 import time
-import tomllib
 
 
 DEFAULT_BAR_WIDTH = 30
@@ -17,14 +16,16 @@ BUILTIN_DEFAULT_TIME = ["30", "5", "0"]
 BUILTIN_DEFAULT_COMPACT = False
 BUILTIN_DEFAULT_NO_BELL = False
 CONFIG_FILENAME = "config.toml"
-
-
-def render_config_text(time_values: list[str], compact: bool, no_bell: bool, bar_width: int) -> str:
-    compact_text = "true" if compact else "false"
-    no_bell_text = "true" if no_bell else "false"
-
-    return f"""# {APP_NAME} config file
-# Default location: ~/.config/pomdot/{CONFIG_FILENAME}
+_CLEAR_LINE = b"\r\x1b[2K"
+_CURSOR_HIDE = "\x1b[?25l"
+_CURSOR_SHOW = "\x1b[?25h"
+_MAX_CACHED_SECONDS = 3600
+_DURATION_RE = re.compile(r"(\d+)([sm]?)")
+_MAX_CACHED_BAR_WIDTH = 4096
+_HASHES = "#" * _MAX_CACHED_BAR_WIDTH
+_DASHES = "-" * _MAX_CACHED_BAR_WIDTH
+_CONFIG_TEMPLATE = """# {app_name} config file
+# Default location: ~/.config/pomdot/{config_filename}
 # Command-line flags override these values.
 
 # time = [FOCUS, REST, REPEAT]
@@ -38,34 +39,57 @@ def render_config_text(time_values: list[str], compact: bool, no_bell: bool, bar
 # - non-negative integer
 # - minimum value: 0
 # - maximum value: none
-time = [\"{time_values[0]}\", \"{time_values[1]}\", \"{time_values[2]}\"]
+time = ["{focus}", "{rest}", "{repeat}"]
 
 # Compact output mode
 # - expected values: true or false
-compact = {compact_text}
+compact = {compact}
 
 # Disable completion bell
 # - expected values: true or false
-no_bell = {no_bell_text}
+no_bell = {no_bell}
 
 # Countdown bar width
 # - expected value: integer
-# - minimum value: {MIN_BAR_WIDTH}
+# - minimum value: {min_bar_width}
 # - maximum value: none
 bar_width = {bar_width}
 """
 
 
+def render_config_text(time_values: list[str], compact: bool, no_bell: bool, bar_width: int) -> str:
+    compact_text = "true" if compact else "false"
+    no_bell_text = "true" if no_bell else "false"
+
+    return _CONFIG_TEMPLATE.format_map(
+        {
+            "focus": time_values[0],
+            "rest": time_values[1],
+            "repeat": time_values[2],
+            "compact": compact_text,
+            "no_bell": no_bell_text,
+            "bar_width": bar_width,
+            "app_name": APP_NAME,
+            "config_filename": CONFIG_FILENAME,
+            "min_bar_width": MIN_BAR_WIDTH,
+        }
+    )
+
+
 def parse_duration(value: str) -> int:
     text = value.strip().lower()
-    match = re.fullmatch(r"(\d+)([sm]?)", text)
-    if not match:
-        raise argparse.ArgumentTypeError(
-            "invalid time format. Use N, Ns, or Nm (examples: 25, 25m, 1500s)."
-        )
+    if text.isdecimal():
+        amount = int(text)
+        unit = "m"
+    else:
+        match = _DURATION_RE.fullmatch(text)
+        if not match:
+            raise argparse.ArgumentTypeError(
+                "invalid time format. Use N, Ns, or Nm (examples: 25, 25m, 1500s)."
+            )
 
-    amount = int(match.group(1))
-    unit = match.group(2) or "m"
+        amount = int(match.group(1))
+        unit = match.group(2) or "m"
 
     if amount <= 0:
         raise argparse.ArgumentTypeError("time must be greater than zero.")
@@ -82,14 +106,15 @@ def format_hhmmss(seconds: int) -> str:
 
 
 def build_bar(remaining: int, total: int, width: int) -> str:
-    ratio = remaining / total if total else 0
-    filled = int(ratio * width)
-    return "[" + ("#" * filled) + ("-" * (width - filled)) + "]"
+    filled = (remaining * width) // total if total else 0
+    if width > _MAX_CACHED_BAR_WIDTH:
+        return "[" + ("#" * filled) + ("-" * (width - filled)) + "]"
+    return f"[{_HASHES[:filled]}{_DASHES[:width - filled]}]"
 
 
 def parse_repeat(value: str) -> int:
     text = value.strip()
-    if not re.fullmatch(r"\d+", text):
+    if not text.isdecimal():
         raise argparse.ArgumentTypeError("repeat count must be a non-negative integer.")
 
     repeats = int(text)
@@ -100,7 +125,7 @@ def parse_repeat(value: str) -> int:
 
 def parse_bar_width(value: str) -> int:
     text = value.strip()
-    if not re.fullmatch(r"\d+", text):
+    if not text.isdecimal():
         raise argparse.ArgumentTypeError("bar width must be an integer.")
 
     width = int(text)
@@ -111,6 +136,7 @@ def parse_bar_width(value: str) -> int:
     return width
 
 
+@cache
 def default_config_path() -> Path:
     return Path.home() / ".config" / "pomdot" / CONFIG_FILENAME
 
@@ -138,12 +164,55 @@ def save_config(path: Path, time_values: list[str], compact: bool, no_bell: bool
     )
 
 
+def validate_config_time(key: str, value, path: Path) -> list[str]:
+    if not isinstance(value, list) or len(value) != 3:
+        raise ValueError(
+            f"invalid '{key}' in {path}: expected an array with 3 values (focus, rest, repeat)."
+        )
+
+    normalized = []
+    for item in value:
+        if isinstance(item, (str, int)):
+            normalized.append(str(item))
+        else:
+            raise ValueError(
+                f"invalid '{key}' in {path}: each value must be a string or integer."
+            )
+    return normalized
+
+
+def validate_config_bool(key: str, value, path: Path) -> bool:
+    if not isinstance(value, bool):
+        raise ValueError(f"invalid '{key}' in {path}: expected true or false.")
+    return value
+
+
+def validate_config_bar_width(key: str, value, path: Path) -> int:
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(f"invalid '{key}' in {path}: expected an integer.")
+    if value < MIN_BAR_WIDTH:
+        raise ValueError(f"invalid '{key}' in {path}: must be at least {MIN_BAR_WIDTH}.")
+    return value
+
+
+_CONFIG_VALIDATORS = {
+    "time": validate_config_time,
+    "compact": validate_config_bool,
+    "no_bell": validate_config_bool,
+    "bar_width": validate_config_bar_width,
+}
+
+
 def load_config(path: Path) -> dict:
-    if not path.exists():
+    try:
+        file_obj = path.open("rb")
+    except (FileNotFoundError, NotADirectoryError):
         return {}
 
+    import tomllib
+
     try:
-        with path.open("rb") as file_obj:
+        with file_obj:
             data = tomllib.load(file_obj)
     except tomllib.TOMLDecodeError as error:
         raise ValueError(f"invalid TOML in config file {path}: {error}") from error
@@ -151,48 +220,14 @@ def load_config(path: Path) -> dict:
     if not isinstance(data, dict):
         raise ValueError(f"invalid config format in {path}: expected a table.")
 
-    allowed_keys = {"time", "compact", "no_bell", "bar_width"}
-    unknown_keys = [key for key in data.keys() if key not in allowed_keys]
+    unknown_keys = data.keys() - _CONFIG_VALIDATORS.keys()
     if unknown_keys:
         keys_text = ", ".join(sorted(unknown_keys))
         raise ValueError(f"unknown config key(s) in {path}: {keys_text}")
 
     validated = {}
-
-    if "time" in data:
-        time_value = data["time"]
-        if not isinstance(time_value, list) or len(time_value) != 3:
-            raise ValueError(
-                f"invalid 'time' in {path}: expected an array with 3 values (focus, rest, repeat)."
-            )
-
-        normalized = []
-        for item in time_value:
-            if isinstance(item, (str, int)):
-                normalized.append(str(item))
-            else:
-                raise ValueError(
-                    f"invalid 'time' in {path}: each value must be a string or integer."
-                )
-        validated["time"] = normalized
-
-    if "compact" in data:
-        compact = data["compact"]
-        if not isinstance(compact, bool):
-            raise ValueError(f"invalid 'compact' in {path}: expected true or false.")
-        validated["compact"] = compact
-
-    if "no_bell" in data:
-        no_bell = data["no_bell"]
-        if not isinstance(no_bell, bool):
-            raise ValueError(f"invalid 'no_bell' in {path}: expected true or false.")
-        validated["no_bell"] = no_bell
-
-    if "bar_width" in data:
-        bar_width = data["bar_width"]
-        if not isinstance(bar_width, int):
-            raise ValueError(f"invalid 'bar_width' in {path}: expected an integer.")
-        validated["bar_width"] = parse_bar_width(str(bar_width))
+    for key, value in data.items():
+        validated[key] = _CONFIG_VALIDATORS[key](key, value, path)
 
     return validated
 
@@ -214,12 +249,20 @@ def normalize_time_values(raw_time: list[str] | None, parser: argparse.ArgumentP
     return values
 
 
-def resolve_with_source(cli_value, config: dict, key: str, default_value):
-    if cli_value is not None:
-        return cli_value, "cli"
-    if key in config:
-        return config[key], "config"
-    return default_value, "default"
+def resolve_all_with_source(specs: list[tuple], config: dict) -> tuple[dict, dict]:
+    values = {}
+    sources = {}
+    for key, cli_value, default_value in specs:
+        if cli_value is not None:
+            values[key] = cli_value
+            sources[key] = "cli"
+        elif key in config:
+            values[key] = config[key]
+            sources[key] = "config"
+        else:
+            values[key] = default_value
+            sources[key] = "default"
+    return values, sources
 
 
 def run_stage(
@@ -230,34 +273,59 @@ def run_stage(
     ring_transition_bell: bool,
     is_last_stage: bool,
 ) -> None:
-    start = dt.datetime.now()
-    end = start + dt.timedelta(seconds=total_seconds)
+    start_ts = time.time()
+    start_tm = time.localtime(start_ts)
+    end_tm = time.localtime(start_ts + total_seconds)
     start_monotonic = time.monotonic()
+    write = sys.stdout.buffer.write
+    flush = sys.stdout.buffer.flush
+    prev_line = None
+    line_prefix = _CLEAR_LINE + f"Stage: {stage_name} | Remaining: ".encode("ascii")
+    bar_cache = []
+    if bar_width <= _MAX_CACHED_BAR_WIDTH:
+        bar_cache = [build_bar(filled, bar_width, bar_width) for filled in range(bar_width + 1)]
+    time_cache = [format_hhmmss(seconds) for seconds in range(min(total_seconds, _MAX_CACHED_SECONDS) + 1)]
 
     if compact:
         print()
     else:
         print(f"\nStage:     {stage_name}")
-        print(f"Start:     {start.strftime('%H:%M:%S')}")
-        print(f"End:       {end.strftime('%H:%M:%S')}")
+        print(f"Start:     {start_tm.tm_hour:02d}:{start_tm.tm_min:02d}:{start_tm.tm_sec:02d}")
+        print(f"End:       {end_tm.tm_hour:02d}:{end_tm.tm_min:02d}:{end_tm.tm_sec:02d}")
+    sys.stdout.flush()
 
     while True:
         elapsed = int(time.monotonic() - start_monotonic)
         remaining = max(0, total_seconds - elapsed)
-        bar = build_bar(remaining, total_seconds, bar_width)
-        line = f"Stage: {stage_name} | Remaining: {format_hhmmss(remaining)} {bar}"
-        print(f"\r\033[2K{line}", end="", flush=True)
+        if bar_cache:
+            filled = (remaining * bar_width) // total_seconds if total_seconds else 0
+            bar = bar_cache[filled]
+        else:
+            bar = build_bar(remaining, total_seconds, bar_width)
+        remaining_text = time_cache[remaining] if remaining <= _MAX_CACHED_SECONDS else format_hhmmss(remaining)
+        line = remaining_text + " " + bar
+        if line != prev_line:
+            write(line_prefix + line.encode("ascii"))
+            flush()
+            prev_line = line
 
         if remaining == 0:
             if ring_transition_bell and not is_last_stage:
                 print("\a", end="", flush=True)
             break
-        time.sleep(1)
+
+        sleep_for = start_monotonic + elapsed + 1 - time.monotonic()
+        if sleep_for > 0:
+            time.sleep(sleep_for)
 
     print()
 
 
 def main() -> int:
+    if sys.argv[1:] == ["--version"]:
+        print(f"{APP_NAME} v{APP_VERSION}")
+        return 0
+
     parser = argparse.ArgumentParser(description="Pomdot terminal timer")
     parser.add_argument(
         "-t",
@@ -332,6 +400,12 @@ def main() -> int:
         action="store_true",
         help="overwrite existing config when used with --write-config",
     )
+    parser.add_argument(
+        "--version",
+        action="version",
+        version=f"{APP_NAME} v{APP_VERSION}",
+        help="show version and exit",
+    )
     args = parser.parse_args()
 
     config_path = Path(args.config).expanduser() if args.config else default_config_path()
@@ -369,54 +443,22 @@ def main() -> int:
     except ValueError as error:
         parser.error(str(error))
 
-    if args.save_config:
-        time_values = cli_time_values if cli_time_values is not None else BUILTIN_DEFAULT_TIME
-        compact = args.compact if args.compact is not None else BUILTIN_DEFAULT_COMPACT
-        no_bell = args.no_bell if args.no_bell is not None else BUILTIN_DEFAULT_NO_BELL
-        bar_width = args.bar_width if args.bar_width is not None else DEFAULT_BAR_WIDTH
-        sources = {
-            "time": "cli" if cli_time_values is not None else "default",
-            "compact": "cli" if args.compact is not None else "default",
-            "no_bell": "cli" if args.no_bell is not None else "default",
-            "bar_width": "cli" if args.bar_width is not None else "default",
-        }
-    else:
-        time_values, time_source = resolve_with_source(
-            cli_time_values,
-            config,
-            "time",
-            BUILTIN_DEFAULT_TIME,
-        )
-        compact, compact_source = resolve_with_source(
-            args.compact,
-            config,
-            "compact",
-            BUILTIN_DEFAULT_COMPACT,
-        )
-        no_bell, no_bell_source = resolve_with_source(
-            args.no_bell,
-            config,
-            "no_bell",
-            BUILTIN_DEFAULT_NO_BELL,
-        )
-        bar_width, bar_width_source = resolve_with_source(
-            args.bar_width,
-            config,
-            "bar_width",
-            DEFAULT_BAR_WIDTH,
-        )
-        sources = {
-            "time": time_source,
-            "compact": compact_source,
-            "no_bell": no_bell_source,
-            "bar_width": bar_width_source,
-        }
+    specs = [
+        ("time", cli_time_values, BUILTIN_DEFAULT_TIME),
+        ("compact", args.compact, BUILTIN_DEFAULT_COMPACT),
+        ("no_bell", args.no_bell, BUILTIN_DEFAULT_NO_BELL),
+        ("bar_width", args.bar_width, DEFAULT_BAR_WIDTH),
+    ]
+    values, sources = resolve_all_with_source(specs, {} if args.save_config else config)
+    time_values = values["time"]
+    compact = values["compact"]
+    no_bell = values["no_bell"]
+    bar_width = values["bar_width"]
 
     try:
         focus_seconds = parse_duration(time_values[0])
         rest_seconds = parse_duration(time_values[1])
         repeats = parse_repeat(time_values[2])
-        bar_width = parse_bar_width(str(bar_width))
     except argparse.ArgumentTypeError as error:
         parser.error(str(error))
 
@@ -444,14 +486,16 @@ def main() -> int:
         return 0
 
     total_cycles = repeats + 1
-    stages = []
-    for cycle in range(1, total_cycles + 1):
-        stages.append((f"Focus {cycle}/{total_cycles}", focus_seconds))
-        stages.append((f"Rest {cycle}/{total_cycles}", rest_seconds))
+    stages = (
+        (f"{kind} {cycle}/{total_cycles}", stage_seconds)
+        for cycle in range(1, total_cycles + 1)
+        for kind, stage_seconds in (("Focus", focus_seconds), ("Rest", rest_seconds))
+    )
+    last_index = 2 * total_cycles - 1
 
     try:
         print(f"{APP_NAME} v{APP_VERSION}")
-        print("\033[?25l", end="", flush=True)
+        print(_CURSOR_HIDE, end="", flush=True)
         for index, (stage_name, stage_seconds) in enumerate(stages):
             run_stage(
                 stage_name,
@@ -459,13 +503,13 @@ def main() -> int:
                 compact,
                 bar_width,
                 ring_transition_bell=not no_bell,
-                is_last_stage=(index == len(stages) - 1),
+                is_last_stage=(index == last_index),
             )
     except KeyboardInterrupt:
         print("\nCancelled.")
         return 130
     finally:
-        print("\033[?25h", end="", flush=True)
+        print(_CURSOR_SHOW, end="", flush=True)
 
     if no_bell:
         print("\nDone!")